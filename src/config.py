@@ -1,17 +1,32 @@
 
 # src/config.py
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 
+@dataclass(frozen=True)
 class Config:
     # Database connection string, defaulting to a local SQLite path if not set
     # In CI/CD, this will be overridden by GitHub Secrets
-    DB_CONNECTION_STRING = os.getenv('DB_URL', 'sqlite:///./data/bynd_pipeline.db')
-    DB_TABLE_NAME = os.getenv('DB_TABLE_NAME', 'customers_and_transactions')
+    DB_CONNECTION_STRING: str = os.getenv('DB_URL', 'sqlite:///./data/bynd_pipeline.db')
+    DB_TABLE_NAME: str = os.getenv('DB_TABLE_NAME', 'customers_and_transactions')
 
     # Path to your input data file within the container
     # This path is relative to the WORKDIR in Dockerfile or mounted volume
-    SOURCE_DATA_FILE = './data/mock_dataset.csv'
+    SOURCE_DATA_FILE: str = './data/mock_dataset.csv'
+
+    # Number of CSV rows read, transformed and written per chunk (roughly 256MB of raw rows)
+    READ_CHUNK_SIZE: int = int(os.getenv('READ_CHUNK_SIZE', '250000'))
 
     # You can add other configurations here as needed
     # For example, if you had a different environment for development vs. production:
-    # ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')
\ No newline at end of file
+    # ENVIRONMENT: str = os.getenv('ENVIRONMENT', 'development')
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Returns the process-wide Config; environment variables are read once, at import."""
+    return Config()
+
+
+CONFIG = get_config()
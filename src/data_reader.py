@@ -1,38 +1,47 @@
 import pandas as pd
 import logging
+from typing import Dict, Iterable, Iterator, List, Optional
 
 logger = logging.getLogger(__name__)
 
 class CSVReader:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, columns: Optional[Iterable[str]] = None, dtypes: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            file_path (str): Path to the CSV file.
+            columns (Iterable[str], optional): Cleaned column names to load; all other
+                                               columns are skipped while parsing. Loads all columns if None.
+            dtypes (Dict[str, str], optional): dtypes keyed by cleaned column name, so the
+                                               parser does not have to infer them.
+        """
         self.file_path = file_path
+        self.columns = set(columns) if columns is not None else None
+        self.dtypes = dtypes or {}
+
+    def _read_csv_options(self) -> dict:
+        """
+        Builds the usecols/dtype arguments for pd.read_csv. Both are keyed by the raw
+        header names, so the header row is read once and mapped to cleaned names.
+        """
+        if self.columns is None and not self.dtypes:
+            return {}
+        raw_columns = pd.read_csv(self.file_path, nrows=0).columns
+        # Match on the normalized (not de-duplicated) names so every raw variant of a column is kept
+        normalized = dict(zip(raw_columns, self._normalize_column_names(raw_columns)))
+        options = {}
+        if self.columns is not None:
+            options['usecols'] = [raw for raw, col in normalized.items() if col in self.columns]
+        if self.dtypes:
+            options['dtype'] = {raw: self.dtypes[col] for raw, col in normalized.items() if col in self.dtypes}
+        return options
 
     def read_data(self) -> pd.DataFrame:
         try:
             logger.info(f"Attempting to read data from {self.file_path}")
-            df = pd.read_csv(self.file_path)
+            df = pd.read_csv(self.file_path, **self._read_csv_options())
             
             # --- START COLUMN CLEANING LOGIC ---
-            # Clean column names: strip whitespace, lowercase, replace spaces with underscores
-            original_columns = df.columns.tolist()
-            new_columns = []
-            seen_columns = set() # To handle potential duplicate names after cleaning
-
-            for col in original_columns:
-                cleaned_col = col.strip().lower().replace(' ', '_')
-                
-                # If a cleaned column name already exists (e.g., from 'account Created at' and 'account created at'),
-                # append a suffix to make it unique temporarily.
-                # The transformer will then pick the correct one.
-                if cleaned_col in seen_columns:
-                    suffix = 1
-                    while f"{cleaned_col}_{suffix}" in seen_columns:
-                        suffix += 1
-                    cleaned_col = f"{cleaned_col}_{suffix}"
-                seen_columns.add(cleaned_col)
-                new_columns.append(cleaned_col)
-            
-            df.columns = new_columns
+            df.columns = self._clean_column_names(df.columns)
             logger.info(f"Cleaned DataFrame columns: {df.columns.tolist()}")
             # --- END COLUMN CLEANING LOGIC ---
 
@@ -45,4 +54,52 @@ class CSVReader:
             raise
         except Exception as e:
             logger.error(f"Error reading CSV file: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def read_data_chunks(self, chunksize: int = 250_000) -> Iterator[pd.DataFrame]:
+        """
+        Reads the CSV file lazily, yielding DataFrames of at most `chunksize` rows with
+        cleaned column names. Only one chunk is held in memory at a time.
+        """
+        try:
+            logger.info(f"Attempting to read data from {self.file_path} in chunks of {chunksize} rows")
+            with pd.read_csv(self.file_path, chunksize=chunksize, **self._read_csv_options()) as chunks:
+                for chunk in chunks:
+                    chunk.columns = self._clean_column_names(chunk.columns)
+                    yield chunk
+        except FileNotFoundError:
+            logger.error(f"Error: File not found at {self.file_path}")
+            raise
+        except pd.errors.EmptyDataError:
+            logger.error(f"Error: No data in file at {self.file_path}")
+            raise
+        except Exception as e:
+            logger.error(f"Error reading CSV file: {e}")
+            raise
+
+    @staticmethod
+    def _normalize_column_names(columns: Iterable[str]) -> pd.Index:
+        """Strips whitespace, lowercases and replaces spaces with underscores in column names."""
+        return pd.Index(columns, dtype=object).str.strip().str.lower().str.replace(' ', '_', regex=False)
+
+    @classmethod
+    def _clean_column_names(cls, original_columns: Iterable[str]) -> List[str]:
+        """Cleans column names and de-duplicates any that collide after cleaning."""
+        cleaned = cls._normalize_column_names(original_columns)
+        if cleaned.is_unique:
+            return cleaned.tolist()
+
+        new_columns = []
+        seen_columns = set()
+        for cleaned_col in cleaned:
+            # If a cleaned column name already exists (e.g., from 'account Created at' and 'account created at'),
+            # append the first free '_n' suffix to make it unique temporarily.
+            # The transformer will then pick the correct one.
+            if cleaned_col in seen_columns:
+                suffix = 1
+                while f"{cleaned_col}_{suffix}" in seen_columns:
+                    suffix += 1
+                cleaned_col = f"{cleaned_col}_{suffix}"
+            seen_columns.add(cleaned_col)
+            new_columns.append(cleaned_col)
+        return new_columns
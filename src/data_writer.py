@@ -1,11 +1,45 @@
+import csv
+import io
 import logging
+from functools import lru_cache
 from sqlalchemy import create_engine, text, inspect
-from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.pool import StaticPool
 import pandas as pd
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Connection pool settings for server databases (PostgreSQL, MySQL, ...).
+# LIFO checkout keeps reusing the most recently returned connections, so surplus idle ones get recycled.
+POOL_OPTIONS = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_timeout': 30,
+    'pool_recycle': 1800,
+    'pool_pre_ping': True,
+    'pool_use_lifo': True,
+}
+
+# Rows sent per INSERT batch in bulk writes
+WRITE_CHUNK_SIZE = 10_000
+# Dialects that accept multi-row INSERT ... VALUES statements of that size
+MULTI_ROW_INSERT_DIALECTS = {'postgresql', 'mysql', 'mariadb'}
+# Bind parameters allowed in one statement by the PostgreSQL/MySQL wire protocols
+MAX_BIND_PARAMETERS = 65_535
+
+@lru_cache(maxsize=None)
+def _create_engine(db_connection_string: str) -> Engine:
+    """Creates one engine (and connection pool) per connection string, shared by all DataWriter instances."""
+    url = make_url(db_connection_string)
+    if url.get_backend_name() == 'sqlite':
+        if url.database in (None, '', ':memory:'):
+            # An in-memory database only lives as long as its connection: share that single connection
+            return create_engine(db_connection_string, poolclass=StaticPool, connect_args={'check_same_thread': False})
+        # File databases keep SQLAlchemy's default SQLite pool, so concurrent writers never share one connection
+        return create_engine(db_connection_string)
+    return create_engine(db_connection_string, **POOL_OPTIONS)
+
 class DataWriter:
     def __init__(self, db_connection_string: str, table_name: str):
         self.db_connection_string = db_connection_string
@@ -16,7 +50,7 @@ class DataWriter:
         """Lazily creates and returns the SQLAlchemy engine, and tests connection."""
         if self.engine is None:
             try:
-                self.engine = create_engine(self.db_connection_string)
+                self.engine = _create_engine(self.db_connection_string)
                 # Test connection and commit for SQLite to ensure connection is live
                 with self.engine.connect() as connection:
                     connection.execute(text("SELECT 1"))
@@ -28,6 +62,45 @@ class DataWriter:
                 raise
         return self.engine
 
+    @staticmethod
+    def _to_sql_options(engine: Engine, df: pd.DataFrame) -> dict:
+        """Chooses the bulk insertion strategy for DataFrame.to_sql based on the database dialect."""
+        if engine.dialect.name == 'sqlite':
+            # SQLite runs in-process, so pandas' default executemany is already faster than multi-row INSERTs
+            return {'chunksize': WRITE_CHUNK_SIZE}
+        if engine.dialect.name in MULTI_ROW_INSERT_DIALECTS:
+            # One multi-row INSERT per chunk, kept under the bind parameter limit
+            return {'method': 'multi', 'chunksize': max(1, min(WRITE_CHUNK_SIZE, MAX_BIND_PARAMETERS // max(1, len(df.columns))))}
+        # Other dialects (Oracle, MSSQL, ...) lack multi-row INSERTs or cap them far lower: keep pandas' default
+        return {}
+
+    def _write_frame(self, engine: Engine, df: pd.DataFrame, if_exists: str):
+        """Writes the rows of df: via COPY on PostgreSQL (psycopg2), via batched DataFrame.to_sql elsewhere."""
+        if engine.dialect.name == 'postgresql' and engine.dialect.driver == 'psycopg2':
+            # pandas creates the table (or applies if_exists) from the full frame, then hands the rows to COPY
+            df.to_sql(self.table_name, con=engine, if_exists=if_exists, index=False, method=self._copy_rows)
+        else:
+            df.to_sql(self.table_name, con=engine, if_exists=if_exists, index=False, **self._to_sql_options(engine, df))
+
+    @staticmethod
+    def _copy_rows(table, conn: Connection, keys: list, data_iter):
+        """
+        DataFrame.to_sql insertion method that loads the rows with PostgreSQL's COPY FROM STDIN,
+        which skips per-row statement parsing and planning. It runs on the connection and in the
+        transaction to_sql created the table in, so a failed COPY rolls the table back as well.
+        """
+        # Nulls are written as \N so empty strings still load as empty strings, not NULL
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator='\n').writerows(['\\N' if value is None else value for value in row] for row in data_iter)
+        buf.seek(0)
+
+        # Quote identifiers the same way to_sql did when it created the table
+        quote = conn.dialect.identifier_preparer.quote
+        table_name = f"{quote(table.schema)}.{quote(table.name)}" if table.schema else quote(table.name)
+        columns = ', '.join(quote(key) for key in keys)
+        with conn.connection.cursor() as cursor:
+            cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buf)
+
     def write_data(self, df: pd.DataFrame, if_exists: str = 'replace'):
         """
         Writes the DataFrame to the database.
@@ -48,19 +121,16 @@ class DataWriter:
             # --- Explicitly handle 'replace' strategy for robustness ---
             if if_exists == 'replace':
                 with engine.connect() as connection:
-                    inspector = inspect(engine)
-                    # Check if the table exists before attempting to drop
-                    if self.table_name in inspector.get_table_names():
-                        logger.info(f"Table '{self.table_name}' exists. Dropping it explicitly.")
-                        connection.execute(text(f"DROP TABLE IF EXISTS {self.table_name}"))
-                        connection.commit() # Commit the drop operation to ensure it takes effect
-                    else:
-                        logger.info(f"Table '{self.table_name}' does not exist, proceeding with creation.")
+                    # DROP TABLE IF EXISTS is a no-op for a missing table, so no existence lookup is needed first
+                    logger.info(f"Dropping table '{self.table_name}' if it exists.")
+                    quoted_table_name = engine.dialect.identifier_preparer.quote(self.table_name)
+                    connection.execute(text(f"DROP TABLE IF EXISTS {quoted_table_name}"))
+                    connection.commit() # Commit the drop operation to ensure it takes effect
                 # After explicit drop, we'll always append (or create if not existing)
-                df.to_sql(self.table_name, con=engine, if_exists='append', index=False)
+                self._write_frame(engine, df, if_exists='append')
             else:
                 # For 'append' or 'fail', let pandas handle it directly
-                df.to_sql(self.table_name, con=engine, if_exists=if_exists, index=False)
+                self._write_frame(engine, df, if_exists=if_exists)
 
             logger.info(f"Data successfully written to table '{self.table_name}'.")
 
@@ -76,8 +146,7 @@ class DataWriter:
         if engine is None:
             return False
         try:
-            inspector = inspect(engine)
-            return self.table_name in inspector.get_table_names()
+            return inspect(engine).has_table(self.table_name)
         except Exception as e:
             logger.error(f"Error checking if table '{self.table_name}' exists: {e}")
             return False
@@ -93,7 +162,11 @@ class DataWriter:
 
         try:
             logger.info(f"Attempting to read data from table '{self.table_name}'...")
-            df = pd.read_sql_table(self.table_name, con=engine)
+            with engine.connect() as connection:
+                if engine.dialect.name == 'postgresql':
+                    # Server-side cursor: rows are streamed to pandas instead of buffered in the driver first
+                    connection = connection.execution_options(stream_results=True)
+                df = pd.read_sql_table(self.table_name, con=connection)
             logger.info(f"Successfully read {len(df)} rows from table '{self.table_name}'.")
             return df
         except Exception as e:
@@ -1,7 +1,7 @@
 from src.data_reader import CSVReader
 from src.transformer import DataTransformer
 from src.data_writer import DataWriter
-from src.config import Config
+from src.config import CONFIG
 import os
 import logging
 
@@ -9,40 +9,56 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Cleaned source columns the transformer uses; everything else is skipped at parse time
+SOURCE_COLUMNS = {'names', 'mail', 'address', 'transactions', 'account_created_at'}
+SOURCE_DTYPES = {'names': 'string', 'mail': 'string', 'address': 'string', 'transactions': 'string'}
+
 def run_pipeline():
     """
     Executes the data engineering pipeline: read, transform, and load.
     
     """
-    config = Config()
+    config = CONFIG
     # Adjust path for execution from project root
     source_filepath = os.path.join(os.path.dirname(__file__), '..', config.SOURCE_DATA_FILE)
 
     print("Starting data pipeline...")
 
-    # 1. Read Data
-    reader = CSVReader(source_filepath)
-    data_df = reader.read_data()
-    logger.info(f"Columns in raw DataFrame after reading CSV: {data_df.columns.tolist()}")
-
-
-    if data_df is None:
-        print("Pipeline aborted due to data reading failure.")
-        return
+    reader = CSVReader(source_filepath, columns=SOURCE_COLUMNS, dtypes=SOURCE_DTYPES)
+    # The raw dataset has addresses with missing closing braces, so let the transformer repair them
+    transformer = DataTransformer(strict=False)
+    writer = DataWriter(config.DB_CONNECTION_STRING, config.DB_TABLE_NAME)
 
-    # 2. Transform Data
-    transformer = DataTransformer()
-    transformed_df = transformer.transform_data(data_df) 
-    logger.info(f"Columns in transformed_df before writing: {transformed_df.columns.tolist()}")
+    # The source is streamed in chunks so only one chunk is held in memory at a time.
+    # The first chunk replaces the table, every later chunk is appended to it.
+    if_exists = 'replace'
+    written_chunks = written_rows = 0
+    try:
+        for data_df in reader.read_data_chunks(chunksize=config.READ_CHUNK_SIZE):
+            # 1. Read Data
+            logger.info(f"Columns in raw DataFrame after reading CSV: {data_df.columns.tolist()}")
 
+            # 2. Transform Data
+            transformed_df = transformer.transform_data(data_df) 
+            logger.info(f"Columns in transformed_df before writing: {transformed_df.columns.tolist()}")
 
-    if transformed_df is None:
-        print("Pipeline aborted due to data transformation failure.")
-        return
+            if transformed_df is None:
+                print("Pipeline aborted due to data transformation failure.")
+                return
 
-    # 3. Sink Data
-    writer = DataWriter(config.DB_CONNECTION_STRING, config.DB_TABLE_NAME) # CHANGE 'DatabaseWriter' to 'DataWriter' and add table_name
-    writer.write_data(transformed_df, if_exists='replace') # REMOVE config.DB_TABLE_NAME from here
+            # 3. Sink Data
+            writer.write_data(transformed_df, if_exists=if_exists)
+            if_exists = 'append'
+            written_chunks += 1
+            written_rows += len(transformed_df)
+    except Exception:
+        if written_chunks:
+            # The table was already replaced by the first chunk, so it is left holding only part of the source
+            logger.error(
+                f"Pipeline failed after writing {written_chunks} chunk(s): table '{config.DB_TABLE_NAME}' is partial "
+                f"and holds only the first {written_rows} rows. Re-run the pipeline to rebuild it."
+            )
+        raise
 
     print("Data pipeline finished.")
 
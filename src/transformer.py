@@ -1,180 +1,492 @@
+import numpy as np
 import pandas as pd
-import json
 import re
 from datetime import datetime
 import logging
 import ast
+from typing import Optional, Tuple
+import orjson
+
+try:
+    # Optional: lets whole columns of addresses and transactions be parsed by Arrow's
+    # multi-threaded JSON reader and processed as Arrow arrays
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.json as pa_json
+except ImportError:
+    pa = None
+
+try:
+    # Optional: compiles the currency amount scanner to native code
+    from numba import njit
+except ImportError:
+    njit = None
 
 
 logger = logging.getLogger(__name__)
 
+# Regular expressions are compiled once at import rather than looked up on every call
+_POST_CODE_UNQUOTED = re.compile(r'([\'"]post code[\'"]:\s*)(\d+(?:-\d+)?)\b')  # Bare post codes, e.g. 42119-57036
+_NULL_VALUE = re.compile(r':\s*("None"|"Null"|None|Null)\b')
+_CURRENCY_SYMBOLS = re.compile(r'[€$£¥]')
+_DECIMAL_COMMA = re.compile(r'[^,]*,[^,]{0,2}')  # A single comma followed by at most two characters
+_NON_NUMERIC = re.compile(r'[^0-9.]')
+
+# Source keys inside the parsed 'address' object and the output columns they map to
+ADDRESS_FIELDS = {
+    'streeet': 'address_street',  # Note 'streeet' (typo in source)
+    'city': 'address_city',
+    'post code': 'address_post_code',  # Note 'post code' (space in source)
+    'country': 'address_country',
+}
+# The same mapping keyed by the column names pd.json_normalize gives the nested fields
+ADDRESS_COLUMNS = {f'address.{key}': column for key, column in ADDRESS_FIELDS.items()}
+# Arrow schema for the normalized address rows; any other keys are ignored while parsing
+ADDRESS_SCHEMA = pa.schema([('address', pa.struct([(key, pa.string()) for key in ADDRESS_FIELDS]))]) if pa is not None else None
+# Arrow schema for transactions rows wrapped as {"transactions": [...]}; only the amounts are kept
+TRANSACTIONS_SCHEMA = pa.schema([('transactions', pa.list_(pa.struct([('amount', pa.string())])))]) if pa is not None else None
+
+# Amounts per call from which the numba scanner is used. Compiling it (or loading it from the cache)
+# costs about a second per process, which the pandas fallback would spend on ~200k amounts.
+_SCAN_KERNEL_MIN_AMOUNTS = 200_000
+
+# Batches that fail to parse are split in halves down to this many rows; the rows of a block this size
+# that still fails are left to the caller's row-by-row fallback
+_MIN_JSON_BLOCK_ROWS = 64
+
+def _read_json_lines(lines: pd.Series, schema) -> Optional[Tuple['pa.Table', np.ndarray]]:
+    """
+    Parses a Series of single-line JSON objects as newline-delimited buffers with pyarrow.
+    A batch that fails to parse against the schema is split in halves and retried, so a malformed
+    row only costs re-parsing the blocks around it. Returns the table, with null rows where parsing
+    failed, and a boolean mask of those rows for the caller to parse row by row.
+    Returns None if pyarrow is not installed.
+    """
+    if pa is None:
+        return None
+    # Every row must be exactly one line of the buffer; multi-line rows are left to the fallback
+    failed = lines.str.contains('\n', regex=False).to_numpy(dtype=bool, na_value=True)
+    rows = lines.mask(failed, '{}').tolist()
+    parse_options = pa_json.ParseOptions(explicit_schema=schema, unexpected_field_behavior='ignore')
+    tables = []
+
+    def read_block(start: int, stop: int) -> None:
+        try:
+            table = pa_json.read_json(pa.BufferReader('\n'.join(rows[start:stop]).encode('utf-8')), parse_options=parse_options)
+            if table.num_rows == stop - start:
+                tables.append(table)
+                return
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        if stop - start <= _MIN_JSON_BLOCK_ROWS:
+            failed[start:stop] = True
+            tables.append(pa.table([pa.nulls(stop - start, field.type) for field in schema], schema=schema))
+        else:
+            middle = (start + stop) // 2
+            read_block(start, middle)
+            read_block(middle, stop)
+
+    if rows:
+        read_block(0, len(rows))
+    if failed.any():
+        logger.info(f"Parsing {failed.sum()} of {len(rows)} rows row by row after pyarrow rejected them")
+    return pa.concat_tables(tables) if tables else schema.empty_table(), failed
+
+def _arrow_utf8_buffers(strings: pd.Series) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Returns the (data, offsets) buffers of a null-free Arrow-backed string Series as NumPy views,
+    so they can be scanned in place. Returns None for any other storage.
+    """
+    if pa is None or strings.dtype != pd.StringDtype('pyarrow') or strings.hasnans:
+        return None
+    arrow = pa.array(strings.array)
+    if isinstance(arrow, pa.ChunkedArray):
+        arrow = arrow.combine_chunks()
+    if pa.types.is_string(arrow.type):
+        offset_dtype = np.int32
+    elif pa.types.is_large_string(arrow.type):
+        offset_dtype = np.int64
+    else:
+        return None
+    _, offsets_buffer, data_buffer = arrow.buffers()
+    if offsets_buffer is None:
+        return None
+    offsets = np.frombuffer(offsets_buffer, dtype=offset_dtype)[arrow.offset:arrow.offset + len(arrow) + 1].astype(np.int64)
+    data = np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None else np.empty(0, dtype=np.uint8)
+    return data, offsets
+
+if njit is not None:
+    @njit(cache=True)
+    def _currency_symbol_length(buf, j, end):
+        """Returns the UTF-8 byte length of the currency symbol ($, £, ¥, €) at buf[j], or 0."""
+        b = buf[j]
+        if b == 0x24:
+            return 1
+        if b == 0xC2 and j + 1 < end and (buf[j + 1] == 0xA3 or buf[j + 1] == 0xA5):
+            return 2
+        if b == 0xE2 and j + 2 < end and buf[j + 1] == 0x82 and buf[j + 2] == 0xAC:
+            return 3
+        return 0
+
+    @njit(cache=True)
+    def _scan_amounts_kernel(buf, offsets):
+        """
+        Parses the UTF-8 amounts packed in buf (row i spans offsets[i]:offsets[i + 1]) with the
+        same separator rules as DataTransformer._clean_currency_amounts. Unparseable rows are NaN.
+        """
+        n = len(offsets) - 1
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            start, end = offsets[i], offsets[i + 1]
+
+            # First pass: count separators and the characters after the last comma, ignoring currency symbols
+            commas = 0
+            periods = 0
+            after_comma = 0
+            j = start
+            while j < end:
+                width = _currency_symbol_length(buf, j, end)
+                if width:
+                    j += width
+                    continue
+                b = buf[j]
+                if b == 0x2C:
+                    commas += 1
+                    after_comma = 0
+                else:
+                    if b == 0x2E:
+                        periods += 1
+                    if commas and (b & 0xC0) != 0x80:  # Count characters, not UTF-8 continuation bytes
+                        after_comma += 1
+                j += 1
+
+            # Pick the decimal separator: a comma for European (1.234,56) or decimal-comma (123,45) amounts,
+            # none when commas are thousands separators (1,234), otherwise a period
+            if commas and periods:
+                decimal = 0x2C
+            elif commas:
+                decimal = 0x2C if commas == 1 and after_comma <= 2 else 0
+            else:
+                decimal = 0x2E
+
+            # Second pass: accumulate the digits; every other character is dropped
+            mantissa = 0.0
+            digits = 0
+            decimals = 0
+            fraction_digits = 0
+            for j in range(start, end):
+                b = buf[j]
+                if 0x30 <= b <= 0x39:
+                    mantissa = mantissa * 10.0 + (b - 0x30)
+                    digits += 1
+                    if decimals:
+                        fraction_digits += 1
+                elif b == decimal:
+                    decimals += 1
+
+            if digits == 0 or decimals > 1:
+                out[i] = np.nan
+            else:
+                out[i] = mantissa / 10.0 ** fraction_digits
+        return out
+
 class DataTransformer:
-    def __init__(self):
-        pass
+    def __init__(self, strict: bool = True):
+        """
+        Args:
+            strict (bool): If True, address strings are expected to be well-formed and malformed ones
+                           are logged and left empty. If False, addresses missing closing braces
+                           are repaired before parsing, at the cost of extra scans of every string.
+        """
+        self.strict = strict
+
+    @classmethod
+    def _parse_addresses(cls, address_series: pd.Series, strict: bool = True) -> pd.DataFrame:
+        """
+        Parses a Series of JSON-like address strings into the flattened address columns.
+        Normalization (stripping, quoting, brace repair unless strict) runs as vectorized string
+        operations over the whole Series. The normalized payloads are then parsed in one
+        batch by pyarrow when available; the rows it rejects, or every row without pyarrow,
+        are parsed by orjson row by row (and ast.literal_eval for rows that are not valid JSON
+        once their quotes are converted).
+        """
+        # Clean the strings first
+        cleaned = address_series.astype('string').str.strip()
+
+        # Fix common issues
+        # 1. Ensure proper closing braces by appending any missing ones (skipped in strict mode,
+        #    where malformed rows are left to fail parsing)
+        if not strict:
+            missing_braces = (cleaned.str.count('{') - cleaned.str.count('}')).clip(lower=0).fillna(0).astype(int)
+            closing_braces = pd.Series('}', index=cleaned.index, dtype='string').str.repeat(missing_braces)
+            cleaned = cleaned + closing_braces
+
+        # 2. Quote bare post codes (e.g. 42119-57036), then convert to JSON: single quotes to double quotes
+        literal = cleaned.str.replace(_POST_CODE_UNQUOTED, r"\1'\2'", regex=True)
+        cleaned = literal.str.replace("'", '"', regex=False)
+
+        parsed = cls._read_addresses_arrow(cleaned)
+        if parsed is None:
+            return cls._load_addresses(cleaned, literal)
 
-    def _parse_address(self, address_str: str) -> dict:
+        address_df, failed = parsed
+        if failed.any():
+            address_df.loc[failed] = cls._load_addresses(cleaned[failed], literal[failed]).to_numpy()
+        return address_df
+
+    @classmethod
+    def _load_addresses(cls, normalized: pd.Series, literal: pd.Series) -> pd.DataFrame:
+        """Parses normalized address strings row by row into the flattened address columns."""
+        parsed = [cls._loads_address(row, literal_row) for row, literal_row in zip(normalized, literal)]
+
+        # Flatten the nested {'address': {...}} dictionaries into 'address.<field>' columns in a single pass
+        address_df = pd.json_normalize(parsed, max_level=1)
+        address_df = address_df.reindex(columns=list(ADDRESS_COLUMNS)).rename(columns=ADDRESS_COLUMNS)
+        address_df.index = normalized.index
+
+        # Fields missing from a parsed address are empty strings; only explicit nulls and unparseable rows stay null
+        addresses = [row.get('address') for row in parsed]
+        missing = pd.DataFrame(
+            {column: [isinstance(address, dict) and key not in address for address in addresses] for key, column in ADDRESS_FIELDS.items()},
+            index=normalized.index,
+        )
+        return address_df.mask(missing, '')
+
+    @staticmethod
+    def _read_addresses_arrow(normalized: pd.Series) -> Optional[Tuple[pd.DataFrame, np.ndarray]]:
+        """
+        Parses normalized address strings in pyarrow batches. Returns the address columns and
+        a mask of the rows pyarrow rejected (left empty), or None if pyarrow is not installed.
+        Arrow reads a missing field and an explicit null alike, so addresses with a null field
+        are also flagged for the row-by-row parse, which tells the two apart.
         """
-        Parses a JSON string representation of an address into a dictionary.
-        Handles common JSON parsing errors like single quotes and extraneous spaces.
+        parsed = _read_json_lines(normalized.fillna('{}').mask(normalized == '', '{}'), ADDRESS_SCHEMA)
+        if parsed is None:
+            return None
+        table, failed = parsed
+
+        # flatten() applies the parent struct's nulls to its fields (rows without an 'address' key)
+        address = table.column('address').combine_chunks()
+        fields = address.flatten()
+        has_null_field = np.zeros(len(address), dtype=bool)
+        for field in fields:
+            has_null_field |= field.is_null().to_numpy(zero_copy_only=False)
+        failed |= has_null_field & address.is_valid().to_numpy(zero_copy_only=False)
+        address_df = pd.DataFrame(
+            {column: field.to_numpy(zero_copy_only=False) for column, field in zip(ADDRESS_FIELDS.values(), fields)},
+            index=normalized.index,
+        )
+        return address_df, failed
+
+    @staticmethod
+    def _loads_address(address_str: str, literal_str: Optional[str] = None) -> dict:
+        """
+        Parses one normalized address string, returning {} if it cannot be parsed.
+        Rows that are not valid JSON, e.g. with an apostrophe in a value ("12 O'Connor St"),
+        are retried with ast.literal_eval on literal_str, the row before its quotes were converted.
         """
         if not isinstance(address_str, str):
             logger.warning(f"Address input was not a string: {address_str}")
             return {}
         try:
-            # Clean the string first
-            cleaned_string = address_str.strip()
-            
-            # Fix common issues
-            # 1. Fix unquoted post codes with hyphens
-            cleaned_string = re.sub(r'(\d+-\d+)', r"'\1'", cleaned_string)
-            
-            # 2. Ensure proper closing braces
-            if cleaned_string.count('{') != cleaned_string.count('}'):
-                # Count opening braces
-                open_braces = cleaned_string.count('{')
-                close_braces = cleaned_string.count('}')
-                
-                # Add missing closing braces
-                if open_braces > close_braces:
-                    missing_braces = open_braces - close_braces
-                    cleaned_string += '}' * missing_braces
-                    #print(f"Added {missing_braces} missing closing brace(s)")
-
+            data = orjson.loads(address_str)
+        except orjson.JSONDecodeError as e:
             try:
-                # Parse the string
-                address_str = re.sub(r'post code\': (\d+-\d+)', r"post code': '\1'", cleaned_string)
-
-                data = ast.literal_eval(address_str)
-                
-                # Extract address information
-                if 'address' in data:
-                    address = data['address']
-                    return {
-                        'street': address.get('streeet', ''),  # Handle typo
-                        'city': address.get('city', ''),
-                        'post_code': str(address.get('post code', '')),  # Convert to string
-                        'country': address.get('country', '')
-                    }
-            except Exception as e:
-                print(f"Error parsing string: {e}")
-                return None
-            except json.JSONDecodeError as e:
+                data = ast.literal_eval(literal_str)
+            except (ValueError, TypeError, SyntaxError):
                 logger.warning(f"Could not parse address string '{address_str}' from row. Error: {e}")
                 return {}
-        except Exception as e:
-            print(f"Error parsing string: {e}")
-            print(f"Problematic string: {address_str}")
+        return data if isinstance(data, dict) else {}
+
+    def _summarize_transactions(self, transactions_series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """Returns the number of transactions and their total amount for every row."""
+        summary = self._summarize_transactions_arrow(transactions_series)
+        if summary is None:
+            return self._summarize_parsed_transactions(transactions_series)
+
+        num_transactions, totals, failed = summary
+        if failed.any():
+            failed_counts, failed_totals = self._summarize_parsed_transactions(transactions_series[failed])
+            num_transactions[failed] = failed_counts.to_numpy()
+            totals[failed] = failed_totals.to_numpy()
+        return num_transactions, totals
+
+    def _summarize_parsed_transactions(self, transactions_series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+        """Counts and totals transactions by parsing every row with orjson."""
+        parsed_transactions = transactions_series.apply(self._parse_transactions)
+        num_transactions = parsed_transactions.map(len)
+
+        # Flatten to one amount per transaction, parse them all at once and sum back per customer
+        transactions = parsed_transactions.reset_index(drop=True).explode()
+        amounts = transactions.map(lambda tx: str(tx.get('amount', '€0,00')) if isinstance(tx, dict) else '€0,00')
+        totals = self._parse_currency_amounts(amounts).groupby(level=0).sum()
+        return num_transactions, pd.Series(totals.to_numpy(), index=transactions_series.index)
+
+    @classmethod
+    def _summarize_transactions_arrow(cls, transactions_series: pd.Series) -> Optional[Tuple[pd.Series, pd.Series, np.ndarray]]:
+        """
+        Counts and totals transactions on Arrow arrays: the rows are parsed in pyarrow batches,
+        the amounts are taken from the flattened list column and summed per row by parent index.
+        Also returns a mask of the rows pyarrow rejected (counted as 0), or None if pyarrow is not installed.
+        """
+        if pa is None:
+            return None
+        # Same normalization as _parse_transactions, applied to the whole column
+        cleaned = transactions_series.astype('string').str.replace("'", '"', regex=False)
+        cleaned = cleaned.str.replace(_NULL_VALUE, ': null', regex=True).str.strip()
+        cleaned = cleaned.fillna('[]').mask(cleaned == '', '[]')
+        parsed = _read_json_lines('{"transactions": ' + cleaned + '}', TRANSACTIONS_SCHEMA)
+        if parsed is None:
             return None
+        table, failed = parsed
+
+        transactions = table.column('transactions').combine_chunks()
+        num_transactions = pc.fill_null(pc.list_value_length(transactions), 0).to_numpy()
+
+        # flatten() applies null transactions to their 'amount' field; missing amounts count as €0,00
+        amounts = pc.fill_null(pc.list_flatten(transactions).flatten()[0], '€0,00')
+        values = cls._parse_currency_amounts(pd.Series(pd.arrays.ArrowStringArray(amounts)))
+        parents = pc.list_parent_indices(transactions).to_numpy()
+        totals = np.bincount(parents, weights=values.to_numpy(), minlength=len(transactions))
+
+        index = transactions_series.index
+        return pd.Series(num_transactions, index=index), pd.Series(totals, index=index), failed
 
     def _parse_transactions(self, transactions_str: str) -> list:
         """
         Parses a JSON string representation of transactions into a list of dictionaries.
         Handles common JSON parsing errors, 'None'/'Null' values, and extraneous spaces.
+        Anything that does not parse to a list (e.g. 'null') is treated as no transactions.
         """
         if not isinstance(transactions_str, str):
             logger.warning(f"Transactions input was not a string: {transactions_str}")
             return []
+        # Replace single quotes with double quotes
+        cleaned_str = transactions_str.replace("'", '"')
+        # Replace string 'None' or 'Null' with JSON null
+        cleaned_str = _NULL_VALUE.sub(': null', cleaned_str)
+        # Remove any trailing non-JSON characters (e.g., spaces)
+        cleaned_str = cleaned_str.strip()
         try:
-            # Replace single quotes with double quotes
-            cleaned_str = transactions_str.replace("'", '"')
-            # Replace string 'None' or 'Null' with JSON null
-            cleaned_str = re.sub(r':\s*("None"|"Null"|None|Null)\b', ': null', cleaned_str)
-            # Remove any trailing non-JSON characters (e.g., spaces)
-            cleaned_str = cleaned_str.strip()
-            return json.loads(cleaned_str)
-        except json.JSONDecodeError as e:
+            transactions = orjson.loads(cleaned_str)
+        except orjson.JSONDecodeError as e:
             logger.warning(f"Could not parse transactions string '{transactions_str}' from row. Error: {e}")
             return []
+        return transactions if isinstance(transactions, list) else []
 
-    def _parse_currency_amount(self, amount_str: str) -> float:
+    @classmethod
+    def _parse_currency_amounts(cls, amounts: pd.Series) -> pd.Series:
         """
-        Parses currency amounts in various formats (€123,45 or $123.45).
-        Returns the numeric value as a float.
+        Parses a Series of currency amounts in various formats (€123,45 or $123.45).
+        Returns the numeric values as floats; unparseable amounts become 0.0.
+        """
+        if njit is not None and len(amounts) >= _SCAN_KERNEL_MIN_AMOUNTS:
+            values = cls._scan_currency_amounts(amounts)
+        else:
+            values = cls._clean_currency_amounts(amounts)
+        for amount_str in amounts[values.isna()]:
+            logger.warning(f"Could not parse currency amount: '{amount_str}'")
+        return values.fillna(0.0).astype(float)
+
+    @staticmethod
+    def _scan_currency_amounts(amounts: pd.Series) -> pd.Series:
+        """
+        Parses currency amounts with the numba-compiled byte scanner. The amounts are packed
+        into one UTF-8 buffer with row offsets; unparseable amounts are returned as NaN.
+        """
+        packed = _arrow_utf8_buffers(amounts)
+        if packed is not None:
+            buf, offsets = packed
+        else:
+            encoded = [amount.encode('utf-8') for amount in amounts.astype('string').fillna('')]
+            offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+            np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+            buf = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return pd.Series(_scan_amounts_kernel(buf, offsets), index=amounts.index)
+
+    @staticmethod
+    def _clean_currency_amounts(amounts: pd.Series) -> pd.Series:
+        """
+        Parses currency amounts with vectorized pandas string operations (used for small batches
+        and when numba is not installed). Unparseable amounts are returned as NaN.
         """
-        if not isinstance(amount_str, str):
-            return 0.0
-        
         # Remove currency symbols
-        cleaned_amount = re.sub(r'[€$£¥]', '', amount_str)
-        
+        cleaned = amounts.astype('string').str.replace(_CURRENCY_SYMBOLS, '', regex=True)
+
         # Handle different decimal separators
-        if ',' in cleaned_amount and '.' in cleaned_amount:
-            # If both comma and period exist, assume European format (1.234,56)
-            # Remove thousands separators (periods) and convert comma to decimal point
-            cleaned_amount = cleaned_amount.replace('.', '').replace(',', '.')
-        elif ',' in cleaned_amount:
-            # Check if comma is likely a decimal separator or thousands separator
-            comma_parts = cleaned_amount.split(',')
-            if len(comma_parts) == 2 and len(comma_parts[1]) <= 2:
-                # Likely decimal separator (123,45)
-                cleaned_amount = cleaned_amount.replace(',', '.')
-            else:
-                # Likely thousands separator (1,234)
-                cleaned_amount = cleaned_amount.replace(',', '')
-        
+        has_comma = cleaned.str.contains(',', regex=False)
+        has_period = cleaned.str.contains('.', regex=False)
+
+        # If both comma and period exist, assume European format (1.234,56):
+        # remove thousands separators (periods) and convert comma to decimal point
+        european = has_comma & has_period
+        cleaned = cleaned.mask(european, cleaned.str.replace('.', '', regex=False).str.replace(',', '.', regex=False))
+
+        # With only a comma, a single comma followed by at most two digits is likely a
+        # decimal separator (123,45); otherwise it is likely a thousands separator (1,234)
+        comma_only = has_comma & ~has_period
+        decimal_comma = comma_only & cleaned.str.fullmatch(_DECIMAL_COMMA)
+        cleaned = cleaned.mask(decimal_comma, cleaned.str.replace(',', '.', regex=False))
+        cleaned = cleaned.mask(comma_only & ~decimal_comma, cleaned.str.replace(',', '', regex=False))
+
         # Remove any remaining non-numeric characters except decimal point
-        cleaned_amount = re.sub(r'[^0-9.]', '', cleaned_amount)
-        
-        try:
-            return float(cleaned_amount)
-        except ValueError:
-            logger.warning(f"Could not parse currency amount: '{amount_str}'")
-            return 0.0
+        cleaned = cleaned.str.replace(_NON_NUMERIC, '', regex=True)
+
+        return pd.to_numeric(cleaned, errors='coerce')
+
+    @staticmethod
+    def _parse_timestamps(values: pd.Series) -> pd.Series:
+        """
+        Parses ISO 8601 timestamps into a naive datetime64 Series; unparseable values become NaT.
+        format='ISO8601' uses pandas' vectorized ISO parser; cache=True parses each distinct timestamp once.
+        """
+        parsed = pd.to_datetime(values, errors='coerce', format='ISO8601', cache=True)
+        if parsed.dtype == object or isinstance(parsed.dtype, pd.DatetimeTZDtype):
+            # Values with a UTC offset (e.g. '...28.470Z') yield timezone-aware Timestamps. Like any other value
+            # outside the naive format they become NaT, so the column stays datetime64 in every chunk
+            parsed = pd.to_datetime(parsed.map(lambda ts: pd.NaT if getattr(ts, 'tzinfo', None) is not None else ts))
+        return parsed
 
     def transform_data(self, df: pd.DataFrame) -> pd.DataFrame:
         logger.info("Applying transformations...")
 
-        # Start with an empty DataFrame and explicitly add transformed columns
-        transformed_df = pd.DataFrame()
+        # Project only the source columns used below into one compact frame, dropping everything else up front
+        date_columns = [col for col in ('account_created_at', 'account_created_at_1') if col in df.columns]
+        source = df[['names', 'mail', 'address', 'transactions'] + date_columns].copy()
+
+        # Collect the transformed columns and build the output DataFrame once at the end,
+        # rather than inserting (and consolidating) one column at a time
+        out = {}
 
         # Core customer details
-        transformed_df['names'] = df['names']
-        transformed_df['email'] = df['mail'] # 'mail' is the cleaned column name for email
+        out['names'] = source['names']
+        out['email'] = source['mail'] # 'mail' is the cleaned column name for email
 
         # 1. Address Transformation and Flattening
         logger.info("Transforming and flattening address data...")
-        # Parse the 'address' JSON string into dictionaries
-        address_components = df['address'].apply(self._parse_address)
-        
-        # Extract specific fields from the parsed address dictionaries
-        # Use .get() to safely access keys, returning None if key is missing
-        transformed_df['address_street'] = address_components.apply(lambda x: x.get('street')) # Note 'streeet' (typo in source)
-        transformed_df['address_city'] = address_components.apply(lambda x: x.get('city'))
-        transformed_df['address_post_code'] = address_components.apply(lambda x: x.get('post_code')) # Note 'post code' (space in source)
-        transformed_df['address_country'] = address_components.apply(lambda x: x.get('country'))
+        # Parse the 'address' JSON strings and flatten them into address_* columns
+        address_df = self._parse_addresses(source['address'], strict=self.strict)
+        out.update(address_df.items())
         
         # The original top-level 'country' column is now effectively ignored in favor of 'address_country'
 
         # 2. Transactions Transformation
         logger.info("Transforming transactions data...")
-        parsed_transactions = df['transactions'].apply(self._parse_transactions)
-        transformed_df['num_transactions'] = parsed_transactions.apply(len)
-
-        def calculate_total_amount(tx_list: list) -> float:
-            total = 0.0
-            for tx in tx_list:
-                amount_str = str(tx.get('amount', '€0,00'))
-                total += self._parse_currency_amount(amount_str)
-            return total
-
-        transformed_df['total_transaction_amount'] = parsed_transactions.apply(calculate_total_amount)
+        out['num_transactions'], out['total_transaction_amount'] = self._summarize_transactions(source['transactions'])
 
         # 3. Date Transformations
         logger.info("Transforming date columns...")
-        # Prioritize 'account_created_at' (from 'account Created at')
-        if 'account_created_at' in df.columns:
-            transformed_df['account_created_at'] = pd.to_datetime(df['account_created_at'], errors='coerce', format='%Y-%m-%d %H:%M:%S.%f')
-        elif 'account_created_at_1' in df.columns:
-             transformed_df['account_created_at'] = pd.to_datetime(df['account_created_at_1'], errors='coerce', format='%Y-%m-%d %H:%M:%S.%f')
+        # Prioritize 'account_created_at' (from 'account Created at').
+        if 'account_created_at' in source.columns:
+            out['account_created_at'] = self._parse_timestamps(source['account_created_at'])
+        elif 'account_created_at_1' in source.columns:
+             out['account_created_at'] = self._parse_timestamps(source['account_created_at_1'])
         else:
-            transformed_df['account_created_at'] = pd.NaT 
+            out['account_created_at'] = pd.Series(pd.NaT, index=source.index, dtype='datetime64[ns]')
 
         # Type conversion for numerical columns
-        if 'num_transactions' in transformed_df.columns:
-            transformed_df['num_transactions'] = transformed_df['num_transactions'].astype(int, errors='ignore')
-        
-        if 'total_transaction_amount' in transformed_df.columns:
-            transformed_df['total_transaction_amount'] = transformed_df['total_transaction_amount'].astype(float, errors='ignore')
+        out['num_transactions'] = out['num_transactions'].astype(int, errors='ignore')
+        out['total_transaction_amount'] = out['total_transaction_amount'].astype(float, errors='ignore')
 
         # Define the final columns and their desired order in the output table
         final_columns_order = [
@@ -189,8 +501,8 @@ class DataTransformer:
             'total_transaction_amount'
         ]
         
-        # Select and reorder columns, dropping any columns not in final_columns_order.
-        transformed_df = transformed_df[final_columns_order]
+        # Build the DataFrame in one go, with the columns in their final order
+        transformed_df = pd.DataFrame(out, columns=final_columns_order)
 
         logger.info("Transformations completed.")
         return transformed_df
\ No newline at end of file
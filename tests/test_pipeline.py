@@ -2,12 +2,16 @@ import pytest
 import pandas as pd
 import sqlite3
 from sqlalchemy import create_engine, text
-from datetime import datetime # Import datetime for proper comparison
+from datetime import datetime, date # Import datetime for proper comparison
+from unittest import mock
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.dialects.postgresql import psycopg2 as pg_psycopg2
 
 # Assuming your modules are correctly importable from src
 from src.data_reader import CSVReader
+from src import transformer as transformer_module
 from src.transformer import DataTransformer
-from src.data_writer import DataWriter
+from src.data_writer import DataWriter, _create_engine
 
 # --- Fixtures ---
 
@@ -62,6 +66,33 @@ def test_csv_reader_read_data_and_clean_columns(mock_csv_path_full):
     assert 'account_created_at' in df.columns
 
 
+def test_csv_reader_clean_column_names_deduplicates():
+    """Tests that colliding cleaned names get the first '_n' suffix that is not already taken."""
+    assert CSVReader._clean_column_names(['a', 'a_1', 'a']) == ['a', 'a_1', 'a_2']
+    assert CSVReader._clean_column_names(['Account Created At', 'account created at']) == ['account_created_at', 'account_created_at_1']
+
+def test_csv_reader_read_data_selected_columns(mock_csv_path_full):
+    """Tests that CSVReader only loads the requested columns, with the given dtypes."""
+    reader = CSVReader(
+        file_path=mock_csv_path_full,
+        columns=['names', 'mail', 'address', 'transactions', 'account_created_at'],
+        dtypes={'names': 'string', 'mail': 'string'},
+    )
+    df = reader.read_data()
+
+    assert df.columns.tolist() == ['names', 'mail', 'address', 'transactions', 'account_created_at']
+    assert df['names'].dtype == 'string'
+    assert len(df) == 3
+
+def test_csv_reader_read_data_chunks(mock_csv_path_full):
+    """Tests that CSVReader streams the file in chunks with cleaned column names."""
+    reader = CSVReader(file_path=mock_csv_path_full)
+    chunks = list(reader.read_data_chunks(chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert all('account_created_at' in chunk.columns for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks), reader.read_data())
+
 # --- Tests for DataTransformer ---
 
 def test_data_transformer_transform_data(mock_csv_path_full):
@@ -120,6 +151,190 @@ def test_data_transformer_transform_data(mock_csv_path_full):
     assert third_row['account_created_at'] == datetime(2023, 3, 20, 14, 45, 0, 987654)
 
 
+def test_data_transformer_transform_data_empty_frame():
+    """Tests that transforming a frame without rows (e.g. a header-only CSV) yields an empty output frame."""
+    empty_df = pd.DataFrame({'names': [], 'mail': [], 'address': [], 'transactions': [], 'account_created_at': []})
+
+    transformed_df = DataTransformer().transform_data(empty_df)
+
+    assert transformed_df.shape == (0, 9)
+
+
+def test_data_transformer_parse_timestamps_keeps_datetime64_with_offsets():
+    """Tests that timestamps with a UTC offset become NaT instead of turning the column into object dtype."""
+    mixed = DataTransformer._parse_timestamps(pd.Series(['2023-01-01 10:00:28.470', '2023-01-01 10:00:28.470Z', 'bad']))
+    assert mixed.dtype == 'datetime64[ns]'
+    assert mixed.tolist()[0] == pd.Timestamp('2023-01-01 10:00:28.470')
+    assert mixed.iloc[1:].isna().all()
+
+    # A chunk of offset-suffixed values only still has the same (naive) dtype
+    aware = DataTransformer._parse_timestamps(pd.Series(['2023-01-01 10:00:28.470Z', '2023-01-02 10:00:28.470+02:00']))
+    assert aware.dtype == 'datetime64[ns]'
+    assert aware.isna().all()
+
+
+def test_data_transformer_summarize_transactions_counts_non_lists_as_empty():
+    """Tests that transactions values that are not JSON lists count as zero transactions."""
+    transactions = pd.Series(["null", "[{'id': 'T1', 'amount': '$1.50'}]", "{'id': 'T2', 'amount': '$2.00'}"])
+
+    num_transactions, totals = DataTransformer()._summarize_transactions(transactions)
+
+    assert num_transactions.tolist() == [0, 1, 0]
+    assert num_transactions.dtype == 'int64'
+    assert totals.tolist() == pytest.approx([0.0, 1.5, 0.0])
+
+
+def test_data_transformer_parse_addresses_handles_raw_formats():
+    """
+    Tests that address parsing handles the quirks found in the raw dataset:
+    unquoted hyphenated post codes, missing closing braces (repaired unless strict)
+    and unparseable rows.
+    """
+    addresses = pd.Series([
+        "{'address': {'streeet': '0418 Hamilton Shores', 'city': 'Molinaburgh', 'post code': 42119-57036, 'country': 'Croatia'}}",
+        "{'address': {'streeet': '07930 Mueller Forges', 'city': 'Port Jessicaberg', 'post code': 08252-13857, 'country': 'Samoa'}   ",
+        "not an address",
+    ])
+
+    address_df = DataTransformer._parse_addresses(addresses, strict=False)
+
+    assert list(address_df.columns) == ['address_street', 'address_city', 'address_post_code', 'address_country']
+    assert address_df.iloc[0]['address_post_code'] == '42119-57036'
+    assert address_df.iloc[1]['address_street'] == '07930 Mueller Forges'
+    assert address_df.iloc[1]['address_post_code'] == '08252-13857' # Leading zero preserved
+    assert address_df.iloc[2].isna().all()
+
+    # Strict parsing skips the brace repair, so the truncated address is left empty
+    strict_df = DataTransformer._parse_addresses(addresses, strict=True)
+    assert strict_df.iloc[0]['address_post_code'] == '42119-57036'
+    assert strict_df.iloc[1].isna().all()
+
+
+def test_data_transformer_parse_addresses_keeps_apostrophes():
+    """Tests that addresses with apostrophes in their values, which are not valid JSON once quotes are converted, still parse."""
+    addresses = pd.Series([
+        "{'address': {'streeet': \"12 O'Connor St\", 'city': 'Abidjan', 'post code': 08252-13857, 'country': \"Cote d'Ivoire\"}}",
+        "{'address': {'streeet': '123 Main St', 'city': 'Anytown', 'post code': '12345', 'country': 'USA'}}",
+    ], index=[5, 6])
+
+    address_df = DataTransformer._parse_addresses(addresses)
+
+    assert address_df.loc[5].tolist() == ["12 O'Connor St", 'Abidjan', '08252-13857', "Cote d'Ivoire"]
+    assert address_df.loc[6].tolist() == ['123 Main St', 'Anytown', '12345', 'USA']
+
+
+def test_data_transformer_parse_addresses_defaults_missing_fields(monkeypatch):
+    """Tests that fields missing from a parsed address come out as empty strings, with and without pyarrow."""
+    addresses = pd.Series([
+        "{'address': {'streeet': 'A'}}",
+        "{'address': {}}",
+        "{'address': {'streeet': 'B', 'city': None, 'post code': '1', 'country': 'X'}}",
+    ])
+
+    for arrow_module in (transformer_module.pa, None):
+        monkeypatch.setattr(transformer_module, 'pa', arrow_module)
+        address_df = DataTransformer._parse_addresses(addresses)
+
+        assert address_df.iloc[0].tolist() == ['A', '', '', '']
+        assert address_df.iloc[1].tolist() == ['', '', '', '']
+        # An explicit null is kept as null
+        assert address_df.iloc[2]['address_street'] == 'B'
+        assert pd.isna(address_df.iloc[2]['address_city'])
+
+
+def test_data_transformer_read_addresses_arrow_isolates_failing_rows():
+    """Tests that a row pyarrow rejects only sends its own block of rows to the row-by-row fallback."""
+    pytest.importorskip('pyarrow')
+    addresses = pd.Series(['{"address": {"streeet": "1 Main St", "city": "Anytown", "post code": "1", "country": "USA"}}'] * 500)
+    addresses.iloc[300] = '{"address": {"streeet": "12 O"Connor St"}}'
+
+    address_df, failed = DataTransformer._read_addresses_arrow(addresses)
+
+    assert failed[300]
+    assert failed.sum() <= 64
+    assert (address_df.loc[~failed, 'address_street'] == '1 Main St').all()
+
+
+def test_data_transformer_parse_currency_amounts():
+    """Tests that currency amounts in mixed formats are parsed as one vectorized batch."""
+    amounts = pd.Series(['€100,50', '$50.25', '£1.234,56', '$1,234', '¥5000', '€266,0', 'None'])
+
+    values = DataTransformer._parse_currency_amounts(amounts)
+
+    assert values.tolist() == pytest.approx([100.50, 50.25, 1234.56, 1234.0, 5000.0, 266.0, 0.0])
+
+
+def test_data_transformer_parse_currency_amounts_uses_scanner_for_large_batches(monkeypatch):
+    """Tests that only batches of at least _SCAN_KERNEL_MIN_AMOUNTS amounts go to the numba scanner."""
+    pytest.importorskip('numba')
+    scanned = []
+    scan = DataTransformer._scan_currency_amounts
+    monkeypatch.setattr(DataTransformer, '_scan_currency_amounts', staticmethod(lambda amounts: scanned.append(len(amounts)) or scan(amounts)))
+    monkeypatch.setattr(transformer_module, '_SCAN_KERNEL_MIN_AMOUNTS', 3)
+
+    assert DataTransformer._parse_currency_amounts(pd.Series(['€1,50', '$2'])).tolist() == [1.5, 2.0]
+    assert DataTransformer._parse_currency_amounts(pd.Series(['€1,50', '$2', '3'])).tolist() == [1.5, 2.0, 3.0]
+    assert scanned == [3]
+
+
+def test_data_transformer_currency_scanner_matches_pandas_path():
+    """Tests that the numba amount scanner agrees with the pandas string-operation fallback."""
+    pytest.importorskip('numba')
+    amounts = pd.Series(['€100,50', '$50.25', '£1.234,56', '$1,234', '1,234,567', '¥5000', '5.', '1.2.3', '', 'None'])
+
+    scanned = DataTransformer._scan_currency_amounts(amounts)
+    cleaned = DataTransformer._clean_currency_amounts(amounts).astype(float)
+
+    pd.testing.assert_series_equal(scanned, cleaned)
+
+def test_data_transformer_currency_scanner_reads_chunked_arrow_strings():
+    """Tests that the numba amount scanner reads multi-chunk and sliced Arrow string arrays in place."""
+    pytest.importorskip('numba')
+    pa = pytest.importorskip('pyarrow')
+    chunked = pa.chunked_array([pa.array(['€100,50']), pa.array(['skip', '$50.25', '£1.234,56']).slice(1)])
+    amounts = pd.Series(pd.arrays.ArrowStringArray(chunked), index=[7, 8, 9])
+
+    scanned = DataTransformer._scan_currency_amounts(amounts)
+
+    pd.testing.assert_series_equal(scanned, pd.Series([100.50, 50.25, 1234.56], index=[7, 8, 9]))
+
+def test_data_transformer_transform_data_falls_back_for_irregular_transactions():
+    """
+    Tests that a transactions column the Arrow batch parser rejects (a numeric amount, an unparsable row)
+    is summarized row by row and stays aligned with a non-default index.
+    """
+    df = pd.DataFrame({
+        'names': ['John Doe', 'Jane Smith', 'Peter Jones'],
+        'mail': ['john.doe@example.com', 'jane.smith@example.com', 'peter.jones@example.com'],
+        'address': ["{'address': {'streeet': '123 Main St', 'city': 'Anytown', 'post code': '12345', 'country': 'USA'}}"] * 3,
+        'transactions': [
+            "[{'id': 'T1', 'amount': '€100,50'}, {'id': 'T2', 'amount': '$50.25'}]",
+            "[{'id': 'T3', 'amount': 5}]",
+            "not a list",
+        ],
+        'account_created_at': ['2023-01-01 10:00:00.123456'] * 3,
+    }, index=[10, 11, 12])
+
+    transformed_df = DataTransformer().transform_data(df)
+
+    assert list(transformed_df.index) == [10, 11, 12]
+    assert transformed_df['num_transactions'].tolist() == [2, 1, 0]
+    assert transformed_df['total_transaction_amount'].tolist() == pytest.approx([150.75, 5.0, 0.0])
+
+def test_data_transformer_summarize_transactions_reparses_only_failing_rows():
+    """Tests that a numeric amount only sends its own block of rows to the row-by-row fallback."""
+    pytest.importorskip('pyarrow')
+    transactions = pd.Series(["[{'id': 'T1', 'amount': '€100,50'}, {'id': 'T2', 'amount': '$50.25'}]"] * 500, index=range(1000, 1500))
+    transactions.iloc[300] = "[{'id': 'T3', 'amount': 5}]"
+
+    _, _, failed = DataTransformer._summarize_transactions_arrow(transactions)
+    num_transactions, totals = DataTransformer()._summarize_transactions(transactions)
+
+    assert failed[300] and failed.sum() <= 64
+    assert num_transactions.loc[1300] == 1 and totals.loc[1300] == pytest.approx(5.0)
+    assert (num_transactions.drop(1300) == 2).all()
+    assert totals.drop(1300).to_numpy() == pytest.approx([150.75] * 499)
+
 # --- Tests for DataWriter ---
 
 def test_data_writer_write_data(temp_sqlite_db_path):
@@ -162,4 +377,117 @@ def test_data_writer_write_data(temp_sqlite_db_path):
         
         # Use pandas.testing.assert_frame_equal for robust DataFrame comparison
         # This will compare values and dtypes (mostly)
-        pd.testing.assert_frame_equal(df_to_write, read_df)
\ No newline at end of file
+        pd.testing.assert_frame_equal(df_to_write, read_df)
+
+def test_data_writer_read_data_round_trip(temp_sqlite_db_path):
+    """Tests that DataWriter.read_data returns what write_data stored, appends included."""
+    df_to_write = pd.DataFrame({'names': ['A', 'B'], 'num_transactions': [1, 2]})
+
+    writer = DataWriter(db_connection_string=temp_sqlite_db_path, table_name="round_trip")
+    writer.write_data(df_to_write, if_exists='replace')
+    writer.write_data(df_to_write, if_exists='append')
+
+    assert writer.table_exists()
+    pd.testing.assert_frame_equal(writer.read_data(), pd.concat([df_to_write, df_to_write], ignore_index=True))
+
+
+def test_data_writer_replaces_reserved_word_table(temp_sqlite_db_path):
+    """Tests that a table named after a reserved word is dropped and rewritten on replace."""
+    writer = DataWriter(db_connection_string=temp_sqlite_db_path, table_name="order")
+    writer.write_data(pd.DataFrame({'names': ['A', 'B']}), if_exists='replace')
+    writer.write_data(pd.DataFrame({'names': ['C']}), if_exists='replace')
+
+    assert writer.read_data()['names'].tolist() == ['C']
+
+
+def test_data_writer_table_exists_sees_other_writers(temp_sqlite_db_path):
+    """Tests that table_exists reflects tables created by another writer on the same database."""
+    reader_side = DataWriter(db_connection_string=temp_sqlite_db_path, table_name="shared")
+    writer_side = DataWriter(db_connection_string=temp_sqlite_db_path, table_name="shared")
+
+    assert not reader_side.table_exists()
+    writer_side.write_data(pd.DataFrame({'names': ['A']}), if_exists='replace')
+    assert reader_side.table_exists()
+
+
+def test_data_writer_shares_one_connection_only_for_in_memory_sqlite(temp_sqlite_db_path):
+    """Tests that only in-memory SQLite engines share a single connection across threads."""
+    assert isinstance(_create_engine("sqlite://").pool, StaticPool)
+    assert isinstance(_create_engine("sqlite:///:memory:").pool, StaticPool)
+    assert not isinstance(_create_engine(temp_sqlite_db_path).pool, StaticPool)
+
+
+def test_data_writer_to_sql_options_per_dialect():
+    """Tests that multi-row INSERTs are only used on dialects that take them."""
+    df = pd.DataFrame({'names': ['A'], 'email': ['a@example.com'], 'num_transactions': [1]})
+    for dialect_name, expected in [
+        ('sqlite', {'chunksize': 10_000}),
+        ('postgresql', {'method': 'multi', 'chunksize': 10_000}),
+        ('mysql', {'method': 'multi', 'chunksize': 10_000}),
+        ('oracle', {}),
+        ('mssql', {}),
+    ]:
+        engine = mock.MagicMock()
+        engine.dialect.name = dialect_name
+        assert DataWriter._to_sql_options(engine, df) == expected, dialect_name
+
+
+def test_data_writer_copies_into_postgres():
+    """
+    Tests the COPY insertion method on the rows DataFrame.to_sql hands it: the table is created
+    by pandas from the full frame, then the rows are loaded with one COPY on the same connection.
+    The SQLAlchemy side runs on SQLite; the psycopg2 cursor is stubbed.
+    """
+    copied = {}
+
+    class StubCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def copy_expert(self, sql, buf):
+            copied['sql'] = sql
+            copied['payload'] = buf.read()
+
+    def copy_with_stub_cursor(table, conn, keys, data_iter):
+        pg_conn = mock.MagicMock(dialect=pg_psycopg2.dialect())
+        pg_conn.connection.cursor.return_value = StubCursor()
+        DataWriter._copy_rows(table, pg_conn, keys, data_iter)
+
+    df = pd.DataFrame({
+        'names': ['A, "x"', '', None],
+        'account_created_at': [pd.Timestamp('2024-05-10 10:30:00.123'), pd.NaT, pd.NaT],
+        'signup_date': [date(2024, 5, 10), None, None],
+        'total_transaction_amount': [1.5, float('nan'), 2.0],
+    })
+    engine = create_engine("sqlite://")
+    df.to_sql("MyTable", con=engine, index=False, method=copy_with_stub_cursor)
+
+    assert copied['sql'] == (
+        'COPY "MyTable" (names, account_created_at, signup_date, total_transaction_amount) '
+        "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+    # Empty strings stay empty fields; only real nulls are written as \N
+    assert copied['payload'].splitlines() == [
+        '"A, ""x""",2024-05-10 10:30:00.123000,2024-05-10,1.5',
+        ',\\N,\\N,\\N',
+        '\\N,\\N,\\N,2.0',
+    ]
+    # Column types come from all rows, so the object column of dates is not created as TEXT
+    with engine.connect() as conn:
+        ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'MyTable'")).scalar()
+    assert 'signup_date DATE' in ddl
+
+
+def test_data_writer_writes_postgres_through_copy(monkeypatch):
+    """Tests that on PostgreSQL the full frame goes through a single to_sql call with the COPY insertion method."""
+    engine = mock.MagicMock(dialect=pg_psycopg2.dialect())
+    calls = []
+    monkeypatch.setattr(pd.DataFrame, 'to_sql', lambda df, name, **kwargs: calls.append((name, len(df), kwargs)))
+
+    df = pd.DataFrame({'names': ['A', 'B']})
+    DataWriter(db_connection_string="postgresql://unused", table_name="customers")._write_frame(engine, df, if_exists='append')
+
+    assert calls == [("customers", 2, {'con': engine, 'if_exists': 'append', 'index': False, 'method': DataWriter._copy_rows})]